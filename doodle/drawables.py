@@ -3,18 +3,19 @@
 A library for creating view hierarchies and rendering them into static images.
 """
 
+import functools
 import os
-import textwrap
+import types
 
 import xml.etree.ElementTree as ET
 
 from enum import Enum, Flag, auto
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageColor, ImageDraw, ImageFont
 
 from .gradient import draw_gradient
 from .utils import round_tuple_values, paste_image
 
-# todo: only recalculate draw/layout/render size/position when values change, not on every get
+# todo: only recalculate render size/position when values change, not on every get
 
 class Drawable:
     """
@@ -78,14 +79,25 @@ class Drawable:
             this drawables gradient with.
     """
 
+    __slots__ = ('_parent', '_size', '_position', '_anchor', '_origin', '_relativeSizeAxes', '_margin', '_marginH', '_marginV', '_drawSize', '_drawPosition', '_layoutSize', '_layoutPosition', '_renderKey', '_renderImage', 'gradientType', 'gradientDirection', 'gradientStops')
+
     def __init__(self, width=0, height=0, x=0, y=0, **kwargs):
-        self.parent = None
-        self.size = (width, height)
-        self.position = (x, y)
-        self.anchor = Anchor.TOP_LEFT
-        self.origin = Anchor.TOP_LEFT
-        self.relativeSizeAxes = Axes.NONE
-        self.margin = (0, 0, 0, 0)
+        # set the layout values directly so we dont invalidate before everything is set
+        self._parent = None
+        self._size = (width, height)
+        self._position = (x, y)
+        self._anchor = Anchor.TOP_LEFT
+        self._origin = Anchor.TOP_LEFT
+        self._relativeSizeAxes = Axes.NONE
+        self._margin = (0, 0, 0, 0)
+        self._marginH = 0
+        self._marginV = 0
+        self._drawSize = None
+        self._drawPosition = None
+        self._layoutSize = None
+        self._layoutPosition = None
+        self._renderKey = None
+        self._renderImage = None
         self.gradientType = None
         self.gradientDirection = None
         self.gradientStops = None
@@ -93,6 +105,71 @@ class Drawable:
         for key, value in kwargs.items():
             setattr(self, key, value)
 
+    @property
+    def parent(self):
+        return self._parent
+
+    @parent.setter
+    def parent(self, value):
+        self._parent = value
+        self.invalidate_layout()
+
+    @property
+    def size(self):
+        return self._size
+
+    @size.setter
+    def size(self, value):
+        self._size = value
+        self.invalidate_layout()
+
+    @property
+    def position(self):
+        return self._position
+
+    @position.setter
+    def position(self, value):
+        self._position = value
+        self.invalidate_layout()
+
+    @property
+    def anchor(self):
+        return self._anchor
+
+    @anchor.setter
+    def anchor(self, value):
+        self._anchor = value
+        self.invalidate_layout()
+
+    @property
+    def origin(self):
+        return self._origin
+
+    @origin.setter
+    def origin(self, value):
+        self._origin = value
+        self.invalidate_layout()
+
+    @property
+    def relativeSizeAxes(self):
+        return self._relativeSizeAxes
+
+    @relativeSizeAxes.setter
+    def relativeSizeAxes(self, value):
+        self._relativeSizeAxes = value
+        self.invalidate_layout()
+
+    @property
+    def margin(self):
+        return self._margin
+
+    @margin.setter
+    def margin(self, value):
+        self._margin = value
+        self._marginH = value[2] + value[3]
+        self._marginV = value[0] + value[1]
+        self.invalidate_layout()
+
     @property
     def width(self):
         """float: The X (first) value of `size`."""
@@ -135,9 +212,15 @@ class Drawable:
         """(int, int): The size in pixels that this drawable will be drawn with
             when rendering."""
 
+        if self._drawSize is not None:
+            return self._drawSize
+
         size = self.size
 
-        if self.relativeSizeAxes is not Axes.NONE:
+        # test the raw flag values, as flag operators are slow
+        axes = self.relativeSizeAxes.value
+
+        if axes:
             if self.parent is None:
                 raise ValueError('cannot use relativeSizeAxes without having a parent')
 
@@ -145,12 +228,13 @@ class Drawable:
             relativeWidth = p[0] * size[0]
             relativeHeight = p[1] * size[1]
 
-            if self.relativeSizeAxes & Axes.X:
+            if axes & _AXES_X:
                 size = (relativeWidth, size[1])
 
-            if self.relativeSizeAxes & Axes.Y:
+            if axes & _AXES_Y:
                 size = (size[0], relativeHeight)
 
+        self._drawSize = size
         return size
 
     @property
@@ -158,54 +242,43 @@ class Drawable:
         """(int, int): The coordinates in pixels of `draw_size`, relative to
             `parent`."""
 
+        if self._drawPosition is not None:
+            return self._drawPosition
+
         position = self.position
+        anchorX, anchorY = _ANCHOR_XY[self.anchor]
 
         if self.parent is not None:
             parentSize = self.parent.children_size
             parentPosition = self.parent.children_position
             size = self.draw_size
-            anchor = self.anchor
-            origin = self.origin
-
-            def anchor_value(anchor):
-                if anchor & Anchor.X_LEFT:
-                    anchorX = 0
-                elif anchor & Anchor.X_CENTER:
-                    anchorX = 0.5
-                elif anchor & Anchor.X_RIGHT:
-                    anchorX = 1
-
-                if anchor & Anchor.Y_TOP:
-                    anchorY = 0
-                elif anchor & Anchor.Y_CENTER:
-                    anchorY = 0.5
-                elif anchor & Anchor.Y_BOTTOM:
-                    anchorY = 1
-
-                return (anchorX, anchorY)
-
-            originPosition = [a * b for a, b in zip(anchor_value(origin), size)]
-            anchorPosition = [a * b for a, b in zip(anchor_value(anchor), parentSize)]
-            anchorPosition = [a + b for a, b in zip(anchorPosition, parentPosition)]
-            anchorOriginPosition = [a - b for a, b in zip(anchorPosition, originPosition)]
-            position = [a + b for a, b in zip(anchorOriginPosition, position)]
-
-        # place the draw position correctly inside margin
-        marginX = 0
-        marginY = 0
-
-        if self.anchor & Anchor.X_LEFT:
-            marginX = self.margin[2]
-        elif self.anchor & Anchor.X_RIGHT:
-            marginX = -self.margin[3]
-
-        if self.anchor & Anchor.Y_TOP:
-            marginY = self.margin[0]
-        elif self.anchor & Anchor.Y_BOTTOM:
-            marginY = -self.margin[1]
-
-        position = (position[0] + marginX, position[1] + marginY)
+            originX, originY = _ANCHOR_XY[self.origin]
 
+            position = (
+                parentPosition[0] + anchorX * parentSize[0] - originX * size[0] + position[0],
+                parentPosition[1] + anchorY * parentSize[1] - originY * size[1] + position[1],
+            )
+
+        # place the draw position correctly inside margin, most drawables dont have one
+        margin = self._margin
+
+        if margin != _NO_MARGIN:
+            marginX = 0
+            marginY = 0
+
+            if anchorX == 0:
+                marginX = margin[2]
+            elif anchorX == 1:
+                marginX = -margin[3]
+
+            if anchorY == 0:
+                marginY = margin[0]
+            elif anchorY == 1:
+                marginY = -margin[1]
+
+            position = (position[0] + marginX, position[1] + marginY)
+
+        self._drawPosition = position
         return position
 
     @property
@@ -213,18 +286,54 @@ class Drawable:
         """(int, int): The size in pixels of this drawable to use when
             calculating layout."""
 
-        s = self.draw_size
+        if self._layoutSize is None:
+            s = self.draw_size
+            self._layoutSize = (s[0] + self._marginH, s[1] + self._marginV)
 
-        return (s[0] + (self.margin[2] + self.margin[3]), s[1] + (self.margin[0] + self.margin[1]))
+        return self._layoutSize
 
     @property
     def layout_position(self):
         """(int, int): The coordinates in pixels of `layout_size`, relative to
             `parent`."""
 
-        p = self.draw_position
+        if self._layoutPosition is None:
+            p = self.draw_position
+            m = self._margin
+            self._layoutPosition = (p[0] - m[2], p[1] - m[0])
 
-        return (p[0] - self.margin[2], p[1] - self.margin[0])
+        return self._layoutPosition
+
+    def invalidate_layout(self):
+        """
+        Clear the cached layout values of this drawable so they are calculated
+        again on their next access.
+
+        This is called automatically whenever a value that affects layout is
+        set, and only needs to be called manually by subclasses that add their
+        own layout affecting values.
+        """
+
+        self._drawSize = None
+        self._drawPosition = None
+        self._layoutSize = None
+        self._layoutPosition = None
+
+    def invalidate_render(self):
+        """
+        Clear the cached render of this drawable and of its parents so they are
+        drawn again on their next render.
+
+        This only needs to be called manually after changing something that
+        the render depends on without going through this drawable, such as
+        editing the image of a `Texture` in place.
+        """
+
+        self._renderKey = None
+
+        # containers key their renders on the ids of their layers, which dont change when an image is edited in place
+        if self.parent is not None:
+            self.parent.invalidate_render()
 
     @property
     def has_gradient(self):
@@ -236,6 +345,14 @@ class Drawable:
 
         return None
 
+    @property
+    def gradient_key(self):
+        """tuple: The gradient values of this drawable, for comparing whether
+            its gradient has changed between renders."""
+
+        stops = tuple((s.position, tuple(s.colour), s.middle) for s in self.gradientStops or [])
+        return (self.gradientType, self.gradientDirection, stops)
+
     def render(self):
         """
         Render this drawable into an `Image`.
@@ -243,11 +360,61 @@ class Drawable:
         This method must be implemented by subclasses.
 
         Returns:
-            Image: The render result.
+            Image: The render result. Drawables may return the same image
+                from multiple renders if nothing has changed, so it should
+                not be modified.
         """
 
         raise NotImplementedError('Drawable subclasses must implement render')
 
+@functools.lru_cache(maxsize=16)
+def _empty_image(size):
+    """
+    Get a fully transparent `Image`.
+
+    The results are cached and shared, so they should not be modified.
+
+    Args:
+        size ((int, int)): The size of the image.
+
+    Returns:
+        Image: A fully transparent image of `size`.
+    """
+
+    return Image.new('RGBA', size, 0)
+
+@functools.lru_cache(maxsize=256)
+def _colour_from_string(string):
+    """
+    Parse a Pillow colour string, reusing the result for repeated strings.
+
+    Args:
+        string (str): The colour string to parse, such as `'red'` or
+            `'#00ff00'`.
+
+    Returns:
+        (int, int, int): The RGB(A) tuple of `string`.
+    """
+
+    return ImageColor.getrgb(string)
+
+def _colour_tuple(colour):
+    """
+    Get a colour as a tuple, so it can be compared and used as a cache key.
+
+    Args:
+        colour (str or (int, int, int)): Any colour that Pillow accepts, either
+            a colour string or an RGB(A) sequence.
+
+    Returns:
+        (int, int, int): The RGB(A) tuple of `colour`.
+    """
+
+    if isinstance(colour, str):
+        return _colour_from_string(colour)
+    else:
+        return tuple(colour)
+
 class Container(Drawable):
     """
     A type of `Drawable` that can have children `Drawable`s.
@@ -271,31 +438,51 @@ class Container(Drawable):
             Defaults to `True`.
     """
 
-    def __init__(self, children=[], **kwargs):
-        self.padding = (0, 0, 0, 0)
+    __slots__ = ('children', '_padding', '_paddingH', '_paddingV', '_childrenSize', '_renderLayers', 'masking')
+
+    def __init__(self, children=None, **kwargs):
+        self._padding = (0, 0, 0, 0)
+        self._paddingH = 0
+        self._paddingV = 0
+        self._childrenSize = None
+        self._renderLayers = None
         self.masking = True
+        self.children = list(children) if children else []
 
         super(Container, self).__init__(**kwargs)
-        self.children = []
 
-        for child in children:
-            self.add(child)
+        for child in self.children:
+            child.parent = self
+
+    @property
+    def padding(self):
+        return self._padding
+
+    @padding.setter
+    def padding(self, value):
+        self._padding = value
+        self._paddingH = value[2] + value[3]
+        self._paddingV = value[0] + value[1]
+        self.invalidate_layout()
 
     @property
     def children_size(self):
         """(int, int): The size in pixels that the children of this container
             are allowed to occupy."""
 
-        s = self.draw_size
+        if self._childrenSize is None:
+            s = self.draw_size
+            self._childrenSize = (s[0] - self._paddingH, s[1] - self._paddingV)
 
-        return (s[0] - (self.padding[2] + self.padding[3]), s[1] - (self.padding[0] + self.padding[1]))
+        return self._childrenSize
 
     @property
     def children_position(self):
         """(int, int): The coordinates in pixels of `children_size`, relative to
             `parent`."""
 
-        return (self.padding[2], self.padding[0])
+        padding = self._padding
+        return (padding[2], padding[0])
 
     @property
     def render_size(self):
@@ -325,12 +512,27 @@ class Container(Drawable):
 
         if not self.masking:
             if self.parent:
-                return [a + b for a, b in zip(self.parent.render_position, self.draw_position)]
+                parentPosition = self.parent.render_position
+                drawPosition = self.draw_position
+                return (parentPosition[0] + drawPosition[0], parentPosition[1] + drawPosition[1])
             else:
                 return self.draw_position
         else:
             return self.draw_position
 
+    def invalidate_layout(self):
+        # children can only cache layout that depends on this container after reading children_size,
+        # so when nothing here is cached theres nothing below to clear, which keeps building deep trees linear
+        if self._childrenSize is None and self._drawSize is None and self._drawPosition is None and self._layoutSize is None and self._layoutPosition is None:
+            return
+
+        super(Container, self).invalidate_layout()
+        self._childrenSize = None
+
+        # the layout of children is relative to this container, so it needs to be recalculated too
+        for child in self.children:
+            child.invalidate_layout()
+
     def add(self, child, index=-1):
         """
         Add a child drawable.
@@ -368,20 +570,91 @@ class Container(Drawable):
         self.children.remove(child)
 
     def render(self):
-        container = Image.new('RGBA', round_tuple_values(self.render_size), (255, 255, 255, 0))
+        size = round_tuple_values(self.render_size)
+
+        if not self.children:
+            return _empty_image(size)
+
+        # children reuse their renders when they havent changed, so if all of them did there is nothing to redraw
+        layers = self.get_layers()
+        renderKey = (size, [(id(i), p) for i, p in layers])
+
+        if renderKey != self._renderKey:
+            container = Image.new('RGBA', size, 0)
+
+            for image, position in layers:
+                paste_image(container, image, position)
+
+            self._renderKey = renderKey
+            self._renderImage = container
+
+            # keep the layer images alive so their ids cant be reused while they are in the key
+            self._renderLayers = layers
+
+        return self._renderImage
+
+    def get_layers(self, renderPosition=None):
+        """
+        Render the children of this container and get where to draw them.
+
+        Args:
+            renderPosition ((int, int)): The `render_position` of this
+                container, if it is already known. Flattened children get theirs
+                passed down this way instead of walking back up the parent
+                tree for it.
+                Defaults to `None`, which uses `render_position`.
+
+        Returns:
+            [(Image, (int, int))]: The rendered images of the children of this
+                container and their positions relative to `render_position`,
+                in drawing order.
+        """
+
+        layers = []
+
+        # this is the same for every child, so only check it once
+        useDrawPosition = self.masking and self.parent is not None and self.parent.masking
+
+        if renderPosition is None and not useDrawPosition:
+            renderPosition = self.render_position
 
         for child in self.children:
-            if self.masking and (self.parent and self.parent.masking):
+            # empty containers have nothing to draw
+            if isinstance(child, Container) and not child.children:
+                continue
+
+            if useDrawPosition:
                 position = child.draw_position
             else:
+                drawPosition = child.draw_position
+                position = (renderPosition[0] + drawPosition[0], renderPosition[1] + drawPosition[1])
+
                 if isinstance(child, Container) and not child.masking:
-                    position = (0, 0)
-                else:
-                    position = [a + b for a, b in zip(self.render_position, child.draw_position)]
+                    # non-masking children render at our render size and position, so they can draw straight onto our image instead of one of their own
+                    layers.extend(child.get_layers(position))
+                    continue
 
-            container = paste_image(container, child.render(), round_tuple_values(position))
+            layers.append((child.render(), round_tuple_values(position)))
 
-        return container
+        return layers
+
+@functools.lru_cache(maxsize=128)
+def _solid_image(size, colour):
+    """
+    Get a solid colour `Image`.
+
+    The results are cached and shared, so they should not be modified.
+
+    Args:
+        size ((int, int)): The size of the image.
+
+        colour ((int, int, int)): The RGB tuple colour to fill the image with.
+
+    Returns:
+        Image: An image of `size` filled with `colour`.
+    """
+
+    return Image.new('RGB', size, colour)
 
 class Box(Drawable):
     """
@@ -394,17 +667,27 @@ class Box(Drawable):
             Defaults to `(255, 255, 255)`.
     """
 
+    __slots__ = ('colour',)
+
     def __init__(self, colour=(255, 255, 255), **kwargs):
         super(Box, self).__init__(**kwargs)
         self.colour = colour
 
     def render(self):
         size = round_tuple_values(self.draw_size)
+        colour = _colour_tuple(self.colour)
+        renderKey = (size, colour, self.gradient_key)
 
-        if self.has_gradient:
-            return self.get_gradient(size[0], size[1])
-        else:
-            return Image.new('RGB', size, self.colour)
+        if renderKey != self._renderKey:
+            if self.has_gradient:
+                self._renderImage = self.get_gradient(size[0], size[1])
+            else:
+                # boxes of the same size and colour can all share one image
+                self._renderImage = _solid_image(size, colour)
+
+            self._renderKey = renderKey
+
+        return self._renderImage
 
 class Texture(Drawable):
     """
@@ -413,28 +696,51 @@ class Texture(Drawable):
     Attributes:
         sizeToImage (bool): Whether or not this texture should automatically
             resize to the size of its image.
+
+        resample (int): The Pillow resampling filter to use when the image has
+            to be resized to fit this texture. Cheaper filters such as
+            `Image.BILINEAR` are much faster on large images.
+            Defaults to `Image.LANCZOS`.
     """
 
-    def __init__(self, sizeToImage=False, **kwargs):
+    __slots__ = ('_image', 'sizeToImage', 'resample')
+
+    def __init__(self, sizeToImage=False, resample=Image.LANCZOS, **kwargs):
         self._image = None
         self.sizeToImage = sizeToImage
+        self.resample = resample
 
         super(Texture, self).__init__(**kwargs)
 
     @property
     def image(self):
-        """Image: The `Image` that this texture should draw."""
+        """Image: The `Image` that this texture should draw.
+            Renders are cached, so after editing this image in place either
+            reassign it or call `invalidate_render`."""
         return self._image
 
     @image.setter
     def image(self, value):
         self._image = value
+        self.invalidate_render()
 
         if self.sizeToImage:
             self.size = value.size
 
     def render(self):
-        return self.image.resize(round_tuple_values(self.draw_size), Image.ANTIALIAS)
+        size = round_tuple_values(self.draw_size)
+
+        # theres no need to resize when the image is already the right size
+        if size == self.image.size:
+            return self.image
+
+        renderKey = (size, self.resample)
+
+        if renderKey != self._renderKey:
+            self._renderImage = self.image.resize(size, self.resample)
+            self._renderKey = renderKey
+
+        return self._renderImage
 
 class TextMode(Enum):
     """
@@ -455,6 +761,146 @@ class TextMode(Enum):
     SQUISH = auto()
     WRAP = auto()
 
+@functools.lru_cache(maxsize=128)
+def _truetype_font(path, size):
+    """
+    Load a true type font, reusing the already loaded font for the same path
+    and size.
+
+    Args:
+        path (str): The path of the TTF file to load.
+
+        size (int): The size of the font.
+
+    Returns:
+        ImageFont: The loaded font.
+    """
+
+    return ImageFont.truetype(path, size)
+
+@functools.lru_cache(maxsize=4096)
+def _text_size(font, text):
+    """
+    Get the size in pixels of text drawn with a font.
+
+    Args:
+        font (ImageFont): The font to measure `text` with.
+
+        text (str): The text to measure.
+
+    Returns:
+        (int, int): The width and height of `text`.
+    """
+
+    return font.getsize(text)
+
+def _text_width(font, text):
+    """
+    Get the width in pixels of text drawn with a font.
+
+    Args:
+        font (ImageFont): The font to measure `text` with.
+
+        text (str): The text to measure.
+
+    Returns:
+        int: The width of `text`.
+    """
+
+    return _text_size(font, text)[0]
+
+def _wrap_text(font, text, width):
+    """
+    Split text into lines that fit inside a width when drawn with a font.
+
+    Lines are broken between words, and a single word that is wider than
+    `width` is broken between its characters instead so it doesnt get clipped.
+
+    Args:
+        font (ImageFont): The font that `text` will be drawn with.
+
+        text (str): The text to wrap.
+
+        width (int): The max width in pixels of each line.
+
+    Returns:
+        [str]: The wrapped lines of `text`.
+    """
+
+    spaceWidth = _text_width(font, ' ')
+    lines = []
+    line = []
+    lineWidth = 0
+
+    for word in text.split():
+        wordWidth = _text_width(font, word)
+
+        if wordWidth > width:
+            if line:
+                lines.append(' '.join(line))
+                line = []
+                lineWidth = 0
+
+            # every line needs at least one character, even if it doesnt fit on its own
+            piece = word[0]
+
+            for character in word[1:]:
+                if _text_width(font, piece + character) > width:
+                    lines.append(piece)
+                    piece = character
+                else:
+                    piece += character
+
+            # the last piece can still share its line with the following words
+            word = piece
+            wordWidth = _text_width(font, word)
+
+        if line and lineWidth + spaceWidth + wordWidth > width:
+            lines.append(' '.join(line))
+            line = []
+            lineWidth = 0
+
+        if line:
+            lineWidth += spaceWidth
+
+        line.append(word)
+        lineWidth += wordWidth
+
+    if line:
+        lines.append(' '.join(line))
+
+    return lines
+
+@functools.lru_cache(maxsize=512)
+def _text_image(font, colour, text):
+    """
+    Get an `Image` for given text drawn with a font and colour.
+
+    The results are cached and shared, so they should not be modified.
+
+    Args:
+        font (ImageFont): The font to draw `text` with.
+
+        colour ((int, int, int)): The RGB tuple colour to draw `text` with.
+
+        text (str): The text to get an image of.
+
+    Returns:
+        Image: An image of `text`.
+    """
+
+    image = Image.new("RGB", _text_size(font, text), "black")
+    alpha = Image.new("L", image.size, "black")
+    draw = ImageDraw.Draw(alpha)
+
+    draw.text((0, 0), text, font=font, fill="white")
+
+    # fill the covered pixels directly instead of compositing a second full size fill image
+    image.paste(colour, mask=alpha.point(lambda p: 255 * (int(p != 0))))
+    image.putalpha(alpha)
+
+    return image
+
 class Text(Drawable):
     """
     A type of `Drawable` that can draw text with true type fonts.
@@ -477,6 +923,8 @@ class Text(Drawable):
             Defaults to 0.
     """
 
+    __slots__ = ('font', '_fontPath', 'textColour', '_textSize', '_text', '_mode', 'lineSpacing')
+
     def __init__(self, fontPath='', textColour=(255, 255, 255), textSize=0, text='', mode=TextMode.SINGLE_LINE, lineSpacing=0, **kwargs):
         super(Text, self).__init__(**kwargs)
 
@@ -547,7 +995,7 @@ class Text(Drawable):
 
         if self.fontPath and self.textSize:
             if os.path.exists(self.fontPath):
-                self.font = ImageFont.truetype(self.fontPath, self.textSize)
+                self.font = _truetype_font(self.fontPath, self.textSize)
 
     def update_size(self):
         """
@@ -557,7 +1005,7 @@ class Text(Drawable):
         if self.text:
             # wrap does not use text size, so dont bother calculating it
             if self.font and self.mode is not TextMode.WRAP:
-                s = self.font.getsize(self.text)
+                s = _text_size(self.font, self.text)
 
                 if self.mode == TextMode.SINGLE_LINE:
                     self.size = s
@@ -565,6 +1013,12 @@ class Text(Drawable):
                     self.size = (self.size[0], s[1])
 
     def render(self):
+        # drawing text is expensive, so reuse the last render if nothing it depends on has changed
+        renderKey = (self.font, self.text, _colour_tuple(self.textColour), self.mode, self.lineSpacing, self.anchor, self.draw_size, self.gradient_key)
+
+        if renderKey == self._renderKey:
+            return self._renderImage
+
         def text_image(text):
             """
             Get an `Image` for given text drawn in this texts specified styling.
@@ -576,93 +1030,57 @@ class Text(Drawable):
                 Image: An image of `text`.
             """
 
-            image = Image.new("RGB", self.font.getsize(text), "black")
-            alpha = Image.new("L", image.size, "black")
-            draw = ImageDraw.Draw(alpha)
-
-            draw.text((0, 0), text, font=self.font, fill="white")
-
             if self.has_gradient:
                 c = (255, 255, 255)
             else:
-                c = self.textColour
-
-            fill = Image.new("RGBA", image.size, c)
-            fillMask = Image.eval(alpha, lambda p: 255 * (int(p != 0)))
-            image = Image.composite(fill, image, fillMask)
-
-            image.putalpha(alpha)
-
-            return image
-
-        def anchored_position(imageSize, parentSize):
-            """
-            Get the anchored position of an image on either the X or Y axis
-            using `anchor`.
-
-            Args:
-                imageSize (float): The width or height of the image to get the
-                    position of.
-
-                parentSize (float): The width or height of the parent to anchor
-                    `imageSize` inside of.
+                c = _colour_tuple(self.textColour)
 
-            Returns:
-                float: The anchored position of `imageSize`, relative to
-                    `parentSize`.
-            """
+            return _text_image(self.font, c, text)
 
-            if self.anchor & Anchor.X_LEFT or self.anchor & Anchor.Y_TOP:
-                return 0
-            elif self.anchor & Anchor.X_CENTER or self.anchor & Anchor.Y_CENTER:
-                return int((parentSize - imageSize) / 2)
-            elif self.anchor & Anchor.X_RIGHT or self.anchor & Anchor.Y_BOTTOM:
-                return parentSize - imageSize
+        anchorX, anchorY = _ANCHOR_XY[self.anchor]
 
         def horizontal_position(image):
-            return anchored_position(image.size[0], size[0])
+            return int((size[0] - image.size[0]) * anchorX)
 
         def vertical_position(image):
-            return anchored_position(image.size[1], size[1])
+            return int((size[1] - image.size[1]) * anchorY)
 
         size = round_tuple_values(self.draw_size)
-        drawImage = Image.new('RGBA', size, (255, 255, 255, 0))
+        renderedText = Image.new('RGBA', size, 0)
 
         if self.mode == TextMode.WRAP:
-            # get an estimate of how many characters there should be per-line
-            limit = int(size[0] / self.font.getsize('a')[0])
-
             textHeight = 0
             lineImages = []
 
-            # get all the line images and the height of textImage
-            for line in textwrap.wrap(self.text, width=limit):
+            # get all the line images and the height of the wrapped text
+            for line in _wrap_text(self.font, self.text, size[0]):
                 lineImage = text_image(line)
                 textHeight += lineImage.size[1] + self.lineSpacing
                 lineImages.append(lineImage)
 
             textHeight = max(textHeight - self.lineSpacing, 0)
-            textImage = Image.new('RGBA', (size[0], textHeight), (255, 255, 255, 0))
-
-            lineY = 0
+            lineY = int((size[1] - textHeight) * anchorY)
 
-            # draw all the line images
+            # draw all the line images straight onto the render, without an intermediate text image
             for lineImage in lineImages:
-                textImage = paste_image(textImage, lineImage, (horizontal_position(lineImage), lineY))
+                paste_image(renderedText, lineImage, (horizontal_position(lineImage), lineY))
                 lineY += lineImage.size[1] + self.lineSpacing
         else:
             textImage = text_image(self.text)
 
             # squish the text if we are squishing and the text needs to be squished
             if self.mode == TextMode.SQUISH and size[0] < textImage.size[0]:
-                textImage = textImage.resize((size[0], textImage.size[1]), Image.ANTIALIAS)
+                textImage = textImage.resize((size[0], textImage.size[1]), Image.LANCZOS)
 
-        renderedText = paste_image(drawImage, textImage, (horizontal_position(textImage), vertical_position(textImage)))
+            paste_image(renderedText, textImage, (horizontal_position(textImage), vertical_position(textImage)))
 
         if self.has_gradient:
             gradient = self.get_gradient(size[0], size[1])
             renderedText = Image.composite(gradient, renderedText, renderedText)
 
+        self._renderKey = renderKey
+        self._renderImage = renderedText
+
         # correctly horizontally and vertically place the text image
         return renderedText;
 
@@ -675,6 +1093,8 @@ class SpriteText(Drawable):
         resizes to fit its text.
     """
 
+    __slots__ = ('_font', '_text')
+
     def __init__(self, font=None, text='', **kwargs):
         super(SpriteText, self).__init__(**kwargs)
 
@@ -697,12 +1117,14 @@ class SpriteText(Drawable):
 
     @property
     def text(self):
-        """str: The text for this sprite text to display."""
+        """str: The text for this sprite text to display. Other values, such as
+            numbers, are converted to strings when set."""
         return self._text
 
     @text.setter
     def text(self, value):
-        self._text = value
+        # convert here so numbers can be both sized and drawn
+        self._text = value if value is None else str(value)
         self.update_size()
 
     def update_size(self):
@@ -714,7 +1136,130 @@ class SpriteText(Drawable):
             self.size = self.font.get_size(self.text)
 
     def render(self):
-        return self.font.get_image(self.text)
+        renderKey = (self.font, self.text)
+
+        if renderKey != self._renderKey:
+            self._renderImage = self.font.get_image(self.text)
+            self._renderKey = renderKey
+
+        return self._renderImage
+
+@functools.lru_cache(maxsize=64)
+def _load_sprite_font(path):
+    """
+    Parse the font.xml of a sprite font.
+
+    Each path is only parsed once, after that the cached result is returned.
+
+    Args:
+        path (str): The path to the sprite fonts folder.
+
+    Returns:
+        ((int, int), int, {str: str}): The character size, character spacing,
+            and read-only character files of the font, see `SpriteFont`.
+
+    Raises:
+        ValueError: If the font at `path` is invalid in any way.
+    """
+
+    file = os.path.join(path, 'font.xml')
+    if os.path.exists(file):
+        tree = ET.parse(file)
+        root = tree.getroot()
+
+        if root.tag == 'font':
+            if 'width' in root.attrib and 'height' in root.attrib and 'spacing' in root.attrib:
+                characterSize = (int(root.get('width')), int(root.get('height')))
+                characterSpacing = int(root.get('spacing'))
+                characterFiles = types.MappingProxyType(dict((n.get('value'), n.text) for n in root.iter('character')))
+
+                return (characterSize, characterSpacing, characterFiles)
+            else:
+                raise ValueError('the root <font> node in font.xml must specify \'width\', \'height\', and \'spacing\' attributes')
+        else:
+            raise ValueError('font.xml must contain a root <font> node')
+    else:
+        raise ValueError(f'could not find a font.xml in \'{path}\'')
+
+@functools.lru_cache(maxsize=16)
+def _load_sprite_font_glyphs(path):
+    """
+    Load every glyph `Image` of a sprite font.
+
+    Each path is only loaded once, after that the cached result is returned so
+    every sprite font loaded from the same path shares the decoded glyphs.
+
+    Args:
+        path (str): The path to the sprite fonts folder.
+
+    Returns:
+        {str: Image}: The read-only glyph images of the font, keyed by the
+            character they represent.
+
+    Raises:
+        ValueError: If the font at `path` is invalid in any way, or a mapped
+            character file does not exist.
+    """
+
+    def load_glyph(file):
+        file = os.path.join(path, file)
+
+        if os.path.exists(file):
+            return Image.open(file).convert('RGBA')
+        else:
+            raise ValueError(f'could not find file \'{file}\'')
+
+    glyphs = {}
+
+    for file in os.listdir(path):
+        if file.endswith('.png') and len(file) == 5:
+            glyphs[file[0]] = load_glyph(file)
+
+    # mapped character files take priority over the default file names
+    for char, file in _load_sprite_font(path)[2].items():
+        glyphs[char] = load_glyph(file)
+
+    return types.MappingProxyType(glyphs)
+
+@functools.lru_cache(maxsize=256)
+def _sprite_font_image(path, characterSize, characterSpacing, text):
+    """
+    Draw text with a sprite font, see `SpriteFont.get_image`.
+
+    This is keyed on the font path and metrics instead of the `SpriteFont`
+    itself, so sprite fonts loaded from the same path share their images.
+
+    Args:
+        path (str): The path to the sprite fonts folder.
+
+        characterSize ((int, int)): See `SpriteFont.characterSize`.
+
+        characterSpacing (int): See `SpriteFont.characterSpacing`.
+
+        text (str): The text to draw.
+
+    Returns:
+        Image: An image of `text` drawn with the font at `path`.
+
+    Raises:
+        ValueError: If there is no glyph for a character in `text`.
+    """
+
+    glyphs = _load_sprite_font_glyphs(path)
+    stride = characterSize[0] + characterSpacing
+    image = Image.new('RGBA', (stride * len(text) + abs(characterSpacing), characterSize[1]), 0)
+
+    lastX = 0
+    for char in text:
+        if char not in glyphs:
+            file = os.path.join(path, f'{char}.png')
+            raise ValueError(f'could not find file \'{file}\' for character \'{char}\'')
+
+        # composite in place so we dont allocate a new image for every character
+        image.alpha_composite(glyphs[char], (lastX, 0))
+        lastX += stride
+
+    return image
 
 class SpriteFont:
     """
@@ -774,7 +1319,8 @@ class SpriteFont:
             character in this font.
 
         characterFiles ({str: str}): All the specified character files from the
-            font file, if any.
+            font file, if any. This mapping is shared between all the sprite
+            fonts loaded from the same path, so it is read-only.
     """
 
     def __init__(self, path):
@@ -783,23 +1329,15 @@ class SpriteFont:
             ValueError: If the font at `path` is invalid in any way.
         """
 
-        file = os.path.join(path, 'font.xml')
-        if os.path.exists(file):
-            tree = ET.parse(file)
-            root = tree.getroot()
-
-            if root.tag == 'font':
-                if 'width' in root.attrib and 'height' in root.attrib and 'spacing' in root.attrib:
-                    self.characterSize = (int(root.get('width')), int(root.get('height')))
-                    self.characterSpacing = int(root.get('spacing'))
-                    self.characterFiles = dict((n.get('value'), n.text) for n in root.iter('character'))
-                    self.path = path
-                else:
-                    raise ValueError('the root <font> node in font.xml must specify \'width\', \'height\', and \'spacing\' attributes')
-            else:
-                raise ValueError('font.xml must contain a root <font> node')
-        else:
-            raise ValueError(f'could not find a font.xml in \'{path}\'')
+        self.characterSize, self.characterSpacing, self.characterFiles = _load_sprite_font(path)
+        self.path = path
+
+        # load every glyph up front so drawing text never has to touch the disk, fonts from the same path share them
+        self._characterImages = _load_sprite_font_glyphs(path)
+
+        # the horizontal distance between the start of each character, and the extra width added to every string
+        self._characterStride = self.characterSize[0] + self.characterSpacing
+        self._spacingWidth = abs(self.characterSpacing)
 
     def get_size(self, text):
         """
@@ -812,7 +1350,7 @@ class SpriteFont:
             (int, int): The size in pixels of `text`.
         """
 
-        return ((self.characterSize[0] + self.characterSpacing) * len(str(text)) + abs(self.characterSpacing), self.characterSize[1])
+        return (self._characterStride * len(text) + self._spacingWidth, self.characterSize[1])
 
     def get_image(self, text):
         """
@@ -822,27 +1360,32 @@ class SpriteFont:
             text (str): The text to draw.
 
         Returns:
-            Image: An image of `text` drawn with this sprite font.
+            Image: An image of `text` drawn with this sprite font. The images
+                are cached and shared between calls with the same text, so
+                they should not be modified.
         """
 
-        image = Image.new('RGBA', self.get_size(text), (255, 255, 255, 0))
+        return _sprite_font_image(self.path, self.characterSize, self.characterSpacing, text)
 
-        lastX = 0
-        for char in text:
-            file = f'{char}.png'
+    def get_character_image(self, char):
+        """
+        Get the glyph `Image` of a character in this sprite font.
 
-            if char in self.characterFiles:
-                file = self.characterFiles[char]
+        Args:
+            char (str): The character to get the glyph of.
 
-            file = os.path.join(self.path, file)
+        Returns:
+            Image: The glyph image of `char`.
 
-            if os.path.exists(file):
-                image = paste_image(image, Image.open(file), (lastX, 0))
-                lastX += (self.characterSize[0] + self.characterSpacing)
-            else:
-                raise ValueError(f'could not find file \'{file}\' for character \'{char}\'')
+        Raises:
+            ValueError: If there is no glyph file for `char`.
+        """
 
-        return image
+        if char in self._characterImages:
+            return self._characterImages[char]
+        else:
+            file = os.path.join(self.path, f'{char}.png')
+            raise ValueError(f'could not find file \'{file}\' for character \'{char}\'')
 
 class Anchor(Flag):
     """
@@ -869,6 +1412,19 @@ class Anchor(Flag):
     BOTTOM_CENTER = X_CENTER | Y_BOTTOM
     BOTTOM_RIGHT = X_RIGHT | Y_BOTTOM
 
+# the relative (from 0 to 1) X and Y points of each anchor in a box
+_ANCHOR_XY = {
+    Anchor.TOP_LEFT: (0, 0),
+    Anchor.TOP_CENTER: (0.5, 0),
+    Anchor.TOP_RIGHT: (1, 0),
+    Anchor.CENTER_LEFT: (0, 0.5),
+    Anchor.CENTER: (0.5, 0.5),
+    Anchor.CENTER_RIGHT: (1, 0.5),
+    Anchor.BOTTOM_LEFT: (0, 1),
+    Anchor.BOTTOM_CENTER: (0.5, 1),
+    Anchor.BOTTOM_RIGHT: (1, 1),
+}
+
 class Axes(Flag):
     """
     Two dimensional axes.
@@ -878,3 +1434,9 @@ class Axes(Flag):
     X = auto()
     Y = auto()
     BOTH = X | Y
+
+_AXES_X = Axes.X.value
+_AXES_Y = Axes.Y.value
+
+# the default margin, used to skip the margin offset in `draw_position`
+_NO_MARGIN = (0, 0, 0, 0)
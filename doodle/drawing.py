@@ -9,17 +9,91 @@ listed in the docstring of their respective `Element` subclass.
 
 For attributes that are of a special type, see the respective `*_from_string`
 method for details on formatting.
+
+Custom `Element` subclasses can be used in drawing files by adding them to
+`ELEMENTS` under their tag name.
 """
 
+import functools
 import operator
 import os
 
-import xml.etree.ElementTree as ET
+# prefer lxml for parsing drawing files when it is installed, as it is faster
+try:
+    from lxml import etree as ET
+
+    # only lxml 5 and up can resolve internal entities without external ones, so use the standard library parser before that
+    if ET.LXML_VERSION < (5,):
+        raise ImportError('lxml 5 or later is needed to parse drawing files')
+
+    # lxml keeps comments and processing instructions as nodes, but elements are only expected to have element children
+    # internal entities are still expanded like the standard library parser does, but drawings cant pull in other files
+    _XML_PARSER = ET.XMLParser(remove_comments=True, remove_pis=True, resolve_entities='internal')
+except ImportError:
+    import xml.etree.ElementTree as ET
+
+    _XML_PARSER = None
 
 from doodle import Drawable, Container, Box, Texture, Text, SpriteText, SpriteFont, Anchor, Axes, TextMode
 from .gradient import Direction, GradientType, GradientStop
 from PIL import Image
 
+# the lookup tables for the `*_from_string` functions, built once instead of on every call
+_ANCHORS = {
+    'top-left': Anchor.TOP_LEFT,
+    'top-center': Anchor.TOP_CENTER,
+    'top-right': Anchor.TOP_RIGHT,
+    'center-left': Anchor.CENTER_LEFT,
+    'center': Anchor.CENTER,
+    'center-right': Anchor.CENTER_RIGHT,
+    'bottom-left': Anchor.BOTTOM_LEFT,
+    'bottom-center': Anchor.BOTTOM_CENTER,
+    'bottom-right': Anchor.BOTTOM_RIGHT,
+}
+
+_AXES = {
+    'none': Axes.NONE,
+    'x': Axes.X,
+    'y': Axes.Y,
+    'both': Axes.BOTH,
+}
+
+_TEXT_MODES = {
+    'single-line': TextMode.SINGLE_LINE,
+    'squish': TextMode.SQUISH,
+    'wrap': TextMode.WRAP,
+}
+
+_OPERATORS = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '>=': operator.ge,
+    '>': operator.gt,
+    '<=': operator.le,
+    '<': operator.lt,
+}
+
+_DIRECTIONS = {
+    'horizontal': Direction.HORIZONTAL,
+    'vertical': Direction.VERTICAL,
+}
+
+_GRADIENT_TYPES = {
+    'linear': GradientType.LINEAR,
+}
+
+_BOOLS = {
+    'true': True,
+    'false': False,
+    '': False,
+}
+
+# the attributes for each side of margin and padding, in the same order as their tuples
+_MARGIN_KEYS = ('margin-top', 'margin-bottom', 'margin-left', 'margin-right')
+_PADDING_KEYS = ('padding-top', 'padding-bottom', 'padding-left', 'padding-right')
+
+_NO_SPACING = (0.0, 0.0, 0.0, 0.0)
+
 def anchor_from_string(string):
     """
     Get an `Anchor` from a string.
@@ -32,23 +106,7 @@ def anchor_from_string(string):
     """
 
     if string:
-        anchors = {
-            'top-left': Anchor.TOP_LEFT,
-            'top-center': Anchor.TOP_CENTER,
-            'top-right': Anchor.TOP_RIGHT,
-            'center-left': Anchor.CENTER_LEFT,
-            'center': Anchor.CENTER,
-            'center-right': Anchor.CENTER_RIGHT,
-            'bottom-left': Anchor.BOTTOM_LEFT,
-            'bottom-center': Anchor.BOTTOM_CENTER,
-            'bottom-right': Anchor.BOTTOM_RIGHT,
-        }
-
-        string = string.lower()
-        if string in anchors:
-            return anchors[string]
-        else:
-            return None
+        return _ANCHORS.get(string.lower())
     else:
         return None
 
@@ -64,18 +122,7 @@ def axes_from_string(string):
     """
 
     if string:
-        axes = {
-            'none': Axes.NONE,
-            'x': Axes.X,
-            'y': Axes.Y,
-            'both': Axes.BOTH,
-        }
-
-        string = string.lower()
-        if string in axes:
-            return axes[string]
-        else:
-            return None
+        return _AXES.get(string.lower())
     else:
         return None
 
@@ -91,24 +138,17 @@ def text_mode_from_string(string):
     """
 
     if string:
-        modes = {
-            'single-line': TextMode.SINGLE_LINE,
-            'squish': TextMode.SQUISH,
-            'wrap': TextMode.WRAP,
-        }
-
-        string = string.lower()
-        if string in modes:
-            return modes[string]
-        else:
-            return None
+        return _TEXT_MODES.get(string.lower())
     else:
         return None
 
+@functools.lru_cache(maxsize=256)
 def colour_from_string(string):
     """
     Get an RGB tuple from an RGB hex string.
 
+    Each string is only parsed once, after that the cached result is returned.
+
     Args:
         string (str): The RGB hex string to parse.
 
@@ -116,10 +156,8 @@ def colour_from_string(string):
         Anchor: An RGB tuple parsed from `string`.
     """
 
-    string = string.lstrip('#')
-    stringBytes = bytearray.fromhex(string)
-
-    return tuple(int(b) for b in stringBytes)
+    # iterating bytes already gives ints, so theres no need to convert each one
+    return tuple(bytes.fromhex(string.lstrip('#')))
 
 def bool_from_string(string):
     """
@@ -132,6 +170,10 @@ def bool_from_string(string):
         bool: Whether `string` is 'true' or not.
     """
 
+    if string in _BOOLS:
+        return _BOOLS[string]
+
+    # only lower unusually cased strings
     return string.lower() == 'true'
 
 def operator_from_string(string):
@@ -146,20 +188,7 @@ def operator_from_string(string):
     """
 
     if string:
-        operators = {
-            '==': operator.eq,
-            '!=': operator.ne,
-            '>=': operator.ge,
-            '>': operator.gt,
-            '<=': operator.le,
-            '<': operator.lt,
-        }
-
-        string = string.lower()
-        if string in operators:
-            return operators[string]
-        else:
-            return None
+        return _OPERATORS.get(string.lower())
     else:
         return None
 
@@ -175,16 +204,7 @@ def direction_from_string(string):
     """
 
     if string:
-        directions = {
-            'horizontal': Direction.HORIZONTAL,
-            'vertical': Direction.VERTICAL,
-        }
-
-        string = string.lower()
-        if string in directions:
-            return directions[string]
-        else:
-            return None
+        return _DIRECTIONS.get(string.lower())
     else:
         return None
 
@@ -200,18 +220,85 @@ def gradient_type_from_string(string):
     """
 
     if string:
-        types = {
-            'linear': GradientType.LINEAR,
-        }
-
-        string = string.lower()
-        if string in types:
-            return types[string]
-        else:
-            return None
+        return _GRADIENT_TYPES.get(string.lower())
     else:
         return None
 
+def _float_attribute(attrib, key, default=0.0):
+    """
+    Get a `float` from an XML attribute.
+
+    Args:
+        attrib ({str: str}): The attributes of the XML element.
+
+        key (str): The name of the attribute to get.
+
+        default (float): The value to use if the attribute is missing or empty.
+            Defaults to `0.0`.
+
+    Returns:
+        float: The value of the attribute, or `default`.
+    """
+
+    value = attrib.get(key)
+    return float(value) if value else default
+
+def _int_attribute(attrib, key, default=0):
+    """
+    Get an `int` from an XML attribute.
+
+    Args:
+        attrib ({str: str}): The attributes of the XML element.
+
+        key (str): The name of the attribute to get.
+
+        default (int): The value to use if the attribute is missing or empty.
+            Defaults to `0`.
+
+    Returns:
+        int: The value of the attribute, or `default`.
+    """
+
+    value = attrib.get(key)
+    return int(value) if value else default
+
+def _try_float(string):
+    """
+    Get a `float` from a string if it is a number.
+
+    Args:
+        string (str): The string to parse.
+
+    Returns:
+        float: The number in `string` if it is one, or `string` if not.
+    """
+
+    try:
+        return float(string)
+    except ValueError:
+        return string
+
+@functools.lru_cache(maxsize=32)
+def _parse_drawing_file(path, modifiedTime):
+    """
+    Parse a drawing file, reusing the already parsed tree if the file has not
+    changed since.
+
+    Elements only read from their XML, so the same tree can be shared between
+    every `Drawing` loaded from the file.
+
+    Args:
+        path (str): The absolute path of the file to parse.
+
+        modifiedTime (float): The modification time of the file, so edited
+            files get parsed again.
+
+    Returns:
+        ET.Element: The root node of the file.
+    """
+
+    return ET.parse(path, _XML_PARSER).getroot()
+
 def element_from_xml(xml):
     """
     Get an `Element` from an XML element.
@@ -223,24 +310,12 @@ def element_from_xml(xml):
         Element: An element from `xml`.
     """
 
-    elements = {
-        'container': ContainerElement,
-        'box': BoxElement,
-        'texture': TextureElement,
-        'text': TextElement,
-        'sprite-text': SpriteTextElement,
-        'switch': SwitchElement,
-        'progress': ProgressElement,
-    }
+    tag = xml.tag
 
-    special = [
-        'option',
-    ]
-
-    if xml.tag in special:
+    if tag in _SPECIAL_TAGS:
         return None
 
-    return elements[xml.tag](xml)
+    return ELEMENTS[tag](xml)
 
 class Element(Drawable):
     """
@@ -267,6 +342,8 @@ class Element(Drawable):
         margin-right: Sets the top value of `margin`.
     """
 
+    __slots__ = ()
+
     def __init__(self, xml):
         """
         Args:
@@ -274,49 +351,49 @@ class Element(Drawable):
                 of this element.
         """
 
-        super(Element, self).__init__()
-        self.anchor = anchor_from_string(xml.get('anchor')) or Anchor.TOP_LEFT
-        self.origin = anchor_from_string(xml.get('origin')) or Anchor.TOP_LEFT
-        self.x = float(xml.get('x') or 0)
-        self.y = float(xml.get('y') or 0)
-        self.relativeSizeAxes = axes_from_string(xml.get('relative-size-axes')) or Axes.NONE
-        self.gradientType = gradient_type_from_string(xml.get('gradient-type'))
-        self.gradientDirection = direction_from_string(xml.get('gradient-direction'))
-
-        if 'size' in xml.attrib:
-            s = float(xml.get('size'))
+        super().__init__()
+        attrib = xml.attrib
+
+        self.anchor = anchor_from_string(attrib.get('anchor')) or Anchor.TOP_LEFT
+        self.origin = anchor_from_string(attrib.get('origin')) or Anchor.TOP_LEFT
+        self.x = _float_attribute(attrib, 'x')
+        self.y = _float_attribute(attrib, 'y')
+        self.relativeSizeAxes = axes_from_string(attrib.get('relative-size-axes')) or Axes.NONE
+        self.gradientType = gradient_type_from_string(attrib.get('gradient-type'))
+        self.gradientDirection = direction_from_string(attrib.get('gradient-direction'))
+
+        if 'size' in attrib:
+            s = float(attrib.get('size'))
             self.size = (s, s)
         else:
-            self.width = float(xml.get('width') or 0)
-            self.height = float(xml.get('height') or 0)
+            self.width = _float_attribute(attrib, 'width')
+            self.height = _float_attribute(attrib, 'height')
 
-        if 'margin' in xml.attrib:
-            m = float(xml.get('margin'))
+        if 'margin' in attrib:
+            m = float(attrib.get('margin'))
             self.margin = (m, m, m, m)
+        elif any(k in attrib for k in _MARGIN_KEYS):
+            self.margin = tuple(_float_attribute(attrib, k) for k in _MARGIN_KEYS)
         else:
-            self.margin = (
-                float(xml.get('margin-top') or 0),
-                float(xml.get('margin-bottom') or 0),
-                float(xml.get('margin-left') or 0),
-                float(xml.get('margin-right') or 0),
-            )
+            # most elements dont have a margin, so share one tuple between them
+            self.margin = _NO_SPACING
 
-        if 'gradient-stops' in xml.attrib:
-            stops = xml.get('gradient-stops').split(',')
-            stops = [s.strip() for s in stops]
+        if 'gradient-stops' in attrib:
+            stops = [s.strip() for s in attrib['gradient-stops'].split(',')]
+            self.gradientStops = []
 
-            if len(stops) > 0:
-                self.gradientStops = []
+            # the distance between stops that dont specify a position
+            step = 1.0 / (len(stops) - 1) if len(stops) > 1 else 0.0
 
-            for i in range(len(stops)):
-                components = stops[i].split(' ')
+            for i, stop in enumerate(stops):
+                components = stop.split(' ')
 
                 colour = colour_from_string(components[0])
 
                 if len(components) >= 2:
                     position = float(components[1])
                 else:
-                    position = (1.0 / (len(stops) - 1)) * i
+                    position = step * i
 
                 if len(components) >= 3:
                     middle = float(components[2])
@@ -361,22 +438,22 @@ class ContainerElement(Element, Container):
         padding-right: Sets the top value of `padding`.
     """
 
+    __slots__ = ()
+
     def __init__(self, xml):
-        super(Container, self).__init__()
-        super(ContainerElement, self).__init__(xml)
+        super().__init__(xml)
+
+        attrib = xml.attrib
 
-        self.masking = bool_from_string(xml.get('masking') or 'true')
+        self.masking = bool_from_string(attrib.get('masking') or 'true')
 
-        if 'padding' in xml.attrib:
-            p = float(xml.get('padding'))
+        if 'padding' in attrib:
+            p = float(attrib.get('padding'))
             self.padding = (p, p, p, p)
+        elif any(k in attrib for k in _PADDING_KEYS):
+            self.padding = tuple(_float_attribute(attrib, k) for k in _PADDING_KEYS)
         else:
-            self.padding = (
-                float(xml.get('padding-top') or 0),
-                float(xml.get('padding-bottom') or 0),
-                float(xml.get('padding-left') or 0),
-                float(xml.get('padding-right') or 0),
-            )
+            self.padding = _NO_SPACING
 
         for node in xml:
             element = element_from_xml(node)
@@ -392,12 +469,15 @@ class BoxElement(Element, Box):
     A `Box` variant of `Element`.
     """
 
+    __slots__ = ()
+
     def __init__(self, xml):
-        super(Box, self).__init__()
-        super(BoxElement, self).__init__(xml)
+        super().__init__(xml)
+
+        attrib = xml.attrib
 
-        if 'colour' in xml.attrib:
-            self.colour = colour_from_string(xml.get('colour'))
+        if 'colour' in attrib:
+            self.colour = colour_from_string(attrib.get('colour'))
 
 class TextureElement(Element, Texture):
     """
@@ -409,16 +489,19 @@ class TextureElement(Element, Texture):
             Supports string formatting.
     """
 
+    __slots__ = ('file',)
+
     def __init__(self, xml):
-        super(Texture, self).__init__()
-        super(TextureElement, self).__init__(xml)
+        super().__init__(xml)
 
-        self.file = xml.get('file')
-        self.sizeToImage = bool_from_string(xml.get('size-to-image') or '')
+        attrib = xml.attrib
+
+        self.file = attrib.get('file')
+        self.sizeToImage = bool_from_string(attrib.get('size-to-image') or '')
 
     def load(self, drawing):
         self.file = drawing.format_string(self.file)
-        self.image = Image.open(os.path.join(drawing.path, self.file))
+        self.image = Image.open(drawing.get_path(self.file))
 
 class TextElement(Element, Text):
     """
@@ -437,22 +520,25 @@ class TextElement(Element, Text):
             there is no leading slash.
     """
 
+    __slots__ = ('relativeFontPath',)
+
     def __init__(self, xml):
-        super(Text, self).__init__()
-        super(TextElement, self).__init__(xml)
+        super().__init__(xml)
+
+        attrib = xml.attrib
 
-        self.relativeFontPath = xml.get('font')
-        self.textSize = int(xml.get('font-size') or 0)
+        self.relativeFontPath = attrib.get('font')
+        self.textSize = _int_attribute(attrib, 'font-size')
         self.text = xml.text
-        self.mode = text_mode_from_string(xml.get('mode')) or TextMode.SINGLE_LINE
-        self.lineSpacing = int(xml.get('line-spacing') or 0)
+        self.mode = text_mode_from_string(attrib.get('mode')) or TextMode.SINGLE_LINE
+        self.lineSpacing = _int_attribute(attrib, 'line-spacing')
 
-        if 'colour' in xml.attrib:
-            self.textColour = colour_from_string(xml.get('colour'))
+        if 'colour' in attrib:
+            self.textColour = colour_from_string(attrib.get('colour'))
 
     def load(self, drawing):
         self.text = drawing.format_string(self.text)
-        self.fontPath = os.path.join(drawing.path, self.relativeFontPath)
+        self.fontPath = drawing.get_path(self.relativeFontPath)
 
 class SpriteTextElement(Element, SpriteText):
     """
@@ -471,16 +557,19 @@ class SpriteTextElement(Element, SpriteText):
             there is no leading slash.
     """
 
+    __slots__ = ('relativeFontPath',)
+
     def __init__(self, xml):
-        super(SpriteText, self).__init__()
-        super(SpriteTextElement, self).__init__(xml)
+        super().__init__(xml)
+
+        attrib = xml.attrib
 
-        self.relativeFontPath = xml.get('font')
+        self.relativeFontPath = attrib.get('font')
         self.text = xml.text
 
     def load(self, drawing):
         self.text = drawing.format_string(self.text)
-        self.font = SpriteFont(os.path.join(drawing.path, self.relativeFontPath))
+        self.font = SpriteFont(drawing.get_path(self.relativeFontPath))
 
 class SwitchElement(ContainerElement):
     """
@@ -503,35 +592,41 @@ class SwitchElement(ContainerElement):
             Supports string formatting.
     """
 
+    __slots__ = ('xml', 'value', 'options', '_optionIndices')
+
     def __init__(self, xml):
-        super(SwitchElement, self).__init__(xml)
+        super().__init__(xml)
 
         self.xml = xml
-        self.value = xml.get('value')
+        attrib = xml.attrib
+
+        self.value = attrib.get('value')
         self.options = [SwitchOption(n) for n in xml.iter('option')]
 
-    def load(self, drawing):
-        super(SwitchElement, self).load(drawing)
+        # the index in `children` each option would be at once chosen, which is after all the non-option nodes before it
+        self._optionIndices = {}
+        index = 0
 
-        self.value = drawing.format_string(self.value)
+        for node in xml:
+            if node.tag == 'option':
+                self._optionIndices[node] = index
+            else:
+                index += 1
 
-        for option in self.options:
-            # cast self.value and option.value to floats if they are a number so the operator works correctly
+    def load(self, drawing):
+        super().load(drawing)
 
-            try: sv = float(self.value)
-            except: sv = self.value
+        self.value = drawing.format_string(self.value)
 
-            for value in option.values:
-                try: ov = float(value)
-                except: ov = value
+        # cast self.value to a float if it is a number so the operator works correctly, option values are cast when they are loaded
+        value = _try_float(self.value)
 
-                if option.operator(sv, ov):
+        for option in self.options:
+            for optionValue in option.values:
+                if option.operator(value, optionValue):
                     # place the option at the correct index so that the elements before and after it are properly on top or below
-                    children = self.xml.getchildren()
-                    children = [c for c in children if (c == option.xml and c.tag == 'option') or c.tag != 'option']
-
                     element = element_from_xml(option.element)
-                    self.add(element, children.index(option.xml))
+                    self.add(element, self._optionIndices[option.xml])
                     element.load(drawing)
 
                     return
@@ -565,6 +660,8 @@ class SwitchOption:
             separate the values with ", ".
     """
 
+    __slots__ = ('xml', 'element', 'operator', 'values')
+
     def __init__(self, xml):
         """
         Args:
@@ -574,8 +671,10 @@ class SwitchOption:
 
         self.xml = xml
         self.element = xml[0]
-        self.operator = operator_from_string(xml.get('operator') or '==')
-        self.values = xml.get('value').split(', ')
+        attrib = xml.attrib
+
+        self.operator = operator_from_string(attrib.get('operator') or '==')
+        self.values = tuple(_try_float(v) for v in attrib.get('value').split(', '))
 
 class ProgressElement(ContainerElement):
     """
@@ -596,15 +695,19 @@ class ProgressElement(ContainerElement):
             Defaults to 100.
     """
 
+    __slots__ = ('axes', 'value', 'max')
+
     def __init__(self, xml):
-        super(ProgressElement, self).__init__(xml)
+        super().__init__(xml)
+
+        attrib = xml.attrib
 
-        self.axes = axes_from_string(xml.get('progress-axes') or 'none')
-        self.value = xml.get('value')
-        self.max = float(xml.get('max') or 100)
+        self.axes = axes_from_string(attrib.get('progress-axes') or 'none')
+        self.value = attrib.get('value')
+        self.max = _float_attribute(attrib, 'max', 100.0)
 
     def load(self, drawing):
-        super(ProgressElement, self).load(drawing)
+        super().load(drawing)
 
         self.value = float(drawing.format_string(self.value)) / self.max
 
@@ -627,6 +730,8 @@ class Drawing(ContainerElement):
         used on a drawing element.
     """
 
+    __slots__ = ('path', 'values', '_pathPrefix')
+
     def __init__(self, file, values):
         """
         Args:
@@ -639,15 +744,17 @@ class Drawing(ContainerElement):
         """
 
         if os.path.exists(file):
-            tree = ET.parse(file)
-            root = tree.getroot()
+            root = _parse_drawing_file(os.path.abspath(file), os.path.getmtime(file))
 
             if root.tag == 'drawing':
                 if 'width' in root.attrib and 'height' in root.attrib:
-                    super(Drawing, self).__init__(root)
+                    super().__init__(root)
                     self.path = os.path.dirname(file)
                     self.values = values
 
+                    # join the folder once so every relative path only needs a concatenation
+                    self._pathPrefix = os.path.join(self.path, '')
+
                     self.load(self)
                 else:
                     raise ValueError('drawing files must specify a width and height in the root <drawing> node')
@@ -656,6 +763,23 @@ class Drawing(ContainerElement):
         else:
             raise ValueError('file does not exist')
 
+    def get_path(self, path):
+        """
+        Get the path of a file referenced by an element in this drawing.
+
+        Args:
+            path (str): The path to get, relative to the drawing file unless it
+                has a leading slash.
+
+        Returns:
+            str: `path` relative to the working directory.
+        """
+
+        if os.path.isabs(path):
+            return path
+        else:
+            return self._pathPrefix + path
+
     def format_string(self, string):
         """
         Format a string using `value`.
@@ -667,7 +791,25 @@ class Drawing(ContainerElement):
             str: `string` formatted with `values`.
         """
 
+        # format_map uses the dict as is, instead of unpacking it into keyword arguments for every string
         if isinstance(self.values, dict):
-            return string.format(**self.values)
+            return string.format_map(self.values)
         else:
             return string.format(self.values)
+
+# the element classes for each tag, this has to be after the classes are defined
+# custom elements can be added with `ELEMENTS['my-tag'] = MyElement`
+ELEMENTS = {
+    'container': ContainerElement,
+    'box': BoxElement,
+    'texture': TextureElement,
+    'text': TextElement,
+    'sprite-text': SpriteTextElement,
+    'switch': SwitchElement,
+    'progress': ProgressElement,
+}
+
+# tags that are handled by their parent element instead of being elements themselves
+_SPECIAL_TAGS = frozenset((
+    'option',
+))
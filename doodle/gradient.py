@@ -8,7 +8,6 @@ import math
 from copy import copy
 from enum import Enum, auto
 from PIL import Image
-from PIL import ImageDraw
 
 # todo: midpoints beyond 0.5 are broken
 
@@ -41,7 +40,8 @@ def gradient(percent, startValue, endValue, middle):
 
 def gradient_tuple(percent, start, end, middle):
     """
-    Call `gradient` with an RGB(A) tuple.
+    Get the gradient colour between two RGB(A) tuples, interpolating each
+    channel the same way as `gradient`.
 
     Args:
         percent (float): See `gradient`.
@@ -56,23 +56,22 @@ def gradient_tuple(percent, start, end, middle):
         (int, int, int, int): The value between `start` and `end` at `percent`,
             taking into account `middle`.
     """
-    colour = ()
 
-    for i in range(3):
-        colour += (round(gradient(percent, start[i], end[i], middle)),)
-
-    def alpha(colour):
-        if len(colour) >= 4:
-            return colour[3]
-        else:
-            return 255
+    # this is called for every pixel of a gradient, so calculate the same value as `gradient` once for all the channels
+    if middle == 0:
+        t = 0.5 * percent
+    else:
+        t = 0.5 * percent / middle
 
-    startA = alpha(start)
-    endA = alpha(end)
-    a = round(gradient(percent, startA, endA, middle))
-    colour += (a,)
+    startA = start[3] if len(start) >= 4 else 255
+    endA = end[3] if len(end) >= 4 else 255
 
-    return colour
+    return (
+        round(start[0] + t * (end[0] - start[0])),
+        round(start[1] + t * (end[1] - start[1])),
+        round(start[2] + t * (end[2] - start[2])),
+        round(startA + t * (endA - startA)),
+    )
 
 def draw_gradient(width, height, type, stops, direction = None):
     """
@@ -100,10 +99,8 @@ def draw_gradient(width, height, type, stops, direction = None):
     if type == GradientType.LINEAR and not direction:
         raise ValueError('all linear gradients must specify a direction')
 
-    image = Image.new('RGBA', (width, height), (255, 255, 255, 0))
-    draw = ImageDraw.Draw(image)
-
-    stops.sort(key=lambda p: p.position)
+    # sort a copy, as the stops belong to the caller and are part of their render cache key
+    stops = sorted(stops, key=lambda p: p.position)
 
     # make sure there is always a final stop at the end
     if stops[-1].position < 1:
@@ -120,36 +117,44 @@ def draw_gradient(width, height, type, stops, direction = None):
         elif direction == Direction.VERTICAL:
             distance = height
 
-    for i in range(distance):
-        start = stops[startIndex]
-        end = stops[endIndex]
+    # theres nothing to draw in an empty image, and it cant be resized to
+    if width <= 0 or height <= 0:
+        return Image.new('RGBA', (max(width, 0), max(height, 0)), 0)
 
-        if type == GradientType.LINEAR:
-            if direction == Direction.HORIZONTAL:
-                startPosition = float(width) * start.position
-                endPosition = float(width) * end.position
-            elif direction == Direction.VERTICAL:
-                startPosition = float(height) * start.position
-                endPosition = float(height) * end.position
+    # the positions in pixels of every stop, which only need to be looked up again when moving to the next stops
+    positions = [float(distance) * s.position for s in stops]
+    lastIndex = len(stops) - 1
 
-        percentage = (i - startPosition) / (endPosition - startPosition)
-        colour = gradient_tuple(percentage, start.colour, end.colour, start.middle)
+    start = stops[startIndex]
+    end = stops[endIndex]
+    startPosition = positions[startIndex]
+    endPosition = positions[endIndex]
 
-        if type == GradientType.LINEAR:
-            if direction == Direction.HORIZONTAL:
-                start = (i, 0)
-                end = (i, height)
-            elif direction == Direction.VERTICAL:
-                start = (0, i)
-                end = (width, i)
+    colours = []
 
-            draw.line([start, end], fill=colour)
+    for i in range(distance):
+        percentage = (i - startPosition) / (endPosition - startPosition)
+        colours.append(gradient_tuple(percentage, start.colour, end.colour, start.middle))
 
         if i >= endPosition:
-            startIndex = min(startIndex + 1, len(stops) - 1)
-            endIndex = min(endIndex + 1, len(stops) - 1)
+            startIndex = min(startIndex + 1, lastIndex)
+            endIndex = min(endIndex + 1, lastIndex)
+
+            start = stops[startIndex]
+            end = stops[endIndex]
+            startPosition = positions[startIndex]
+            endPosition = positions[endIndex]
+
+    # draw the colours into a single row or column, then stretch it over the whole image instead of drawing a line for every pixel
+    if type == GradientType.LINEAR:
+        if direction == Direction.HORIZONTAL:
+            line = Image.new('RGBA', (distance, 1), 0)
+        elif direction == Direction.VERTICAL:
+            line = Image.new('RGBA', (1, distance), 0)
+
+    line.putdata(colours)
 
-    return image
+    return line.resize((width, height), Image.NEAREST)
 
 class Direction(Enum):
     """
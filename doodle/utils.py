@@ -3,27 +3,28 @@
 Basic general utilities for doodle.
 """
 
-from PIL import Image
-
 def round_tuple_values(inputTuple):
     """
-    Round all the values in a tuple.
+    Round both the values in a two value tuple, such as a size or position.
 
     Args:
         inputTuple ((float, float)): The tuple to round the values of.
 
     Returns:
-        (int, int): `inputTuple` with all its values rounded.
+        (int, int): `inputTuple` with both its values rounded.
     """
 
-    return tuple(round(v) for v in inputTuple)
+    return (round(inputTuple[0]), round(inputTuple[1]))
 
 def paste_image(background, foreground, position):
     """
     Paste an `Image` onto another `Image` with alpha compositing.
 
+    Only the area of `background` that `foreground` covers is composited, and
+    it is done in place.
+
     Args:
-        background (Image): The image to paste onto.
+        background (Image): The RGBA image to paste onto, this is modified.
 
         foreground (Image): The image to paste.
 
@@ -31,9 +32,24 @@ def paste_image(background, foreground, position):
             `foreground` at.
 
     Returns:
-        Image: The alpha composited image.
+        Image: `background`, with `foreground` composited onto it.
     """
 
-    temp = Image.new('RGBA', background.size, (255, 255, 255, 0))
-    temp.paste(foreground, position)
-    return Image.alpha_composite(background, temp)
+    x, y = position
+
+    # opaque images cover everything beneath them, so they can be pasted without blending
+    if foreground.mode == 'RGB':
+        background.paste(foreground, (x, y))
+        return background
+
+    if foreground.mode != 'RGBA':
+        foreground = foreground.convert('RGBA')
+
+    # alpha_composite only supports positive destinations, so crop off the parts of foreground that are outside the top and left of background instead
+    left = max(-x, 0)
+    top = max(-y, 0)
+
+    if left < foreground.width and top < foreground.height:
+        background.alpha_composite(foreground, (x + left, y + top), (left, top))
+
+    return background
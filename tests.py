@@ -3,6 +3,9 @@ from doodle import Drawable, Container, Box, Texture, Text, SpriteText, SpriteFo
 
 from PIL import Image
 
+import xml.etree.ElementTree
+import doodle.drawing
+
 def container_test():
     container = Container(
         size=(400, 400),
@@ -472,6 +475,19 @@ def drawing_test():
     drawing = Drawing('tests/assets/drawing.xml', values)
     drawing.render().save('tests/drawing_test.png')
 
+def drawing_entity_test():
+    path = 'tests/assets/entity_drawing.xml'
+
+    # internal entities should expand the same way with lxml as with the standard library parser
+    for parsed in (xml.etree.ElementTree.parse(path), doodle.drawing.ET.parse(path, doodle.drawing._XML_PARSER)):
+        root = parsed.getroot()
+        tags = [child.tag for child in root]
+        assert tags == ['box', 'box', 'text'], tags
+        assert root[2].text == 'hello {name}', root[2].text
+
+    drawing = Drawing(path, {'name': 'world'})
+    drawing.render().save('tests/drawing_entity_test.png')
+
 def gradient_test():
     points = [
         GradientStop(0, (255, 0, 0), 0.1),
@@ -499,4 +515,5 @@ if __name__ == '__main__':
     text_test()
     sprite_text_test()
     drawing_test()
+    drawing_entity_test()
     gradient_test()